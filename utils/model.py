@@ -3,17 +3,26 @@
 ## the total number of bike rentals based on other parameters (excluding 'casual' and 'registered').
 
 
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_absolute_error, r2_score
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def train_and_evaluate_model(df: pd.DataFrame) -> None:
+    # Imported lazily: pandas and sklearn cost seconds on a cold import,
+    # which would otherwise land on every `from utils import ...` even when
+    # no model is ever trained.
+    import numpy as np
+    from joblib import Memory
+    from sklearn.model_selection import train_test_split
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.inspection import permutation_importance
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.preprocessing import OrdinalEncoder
+    from sklearn.compose import ColumnTransformer
     df = df[['season', 'year', 'mnth', 'hour', 'holiday', 'weekday', 'workingday','weather', 'temp', 'humidity', 'windspeed', 'total']]
 
     # Prepare features and target
@@ -24,25 +33,49 @@ def train_and_evaluate_model(df: pd.DataFrame) -> None:
     categorical_cols = ['season', 'weekday', 'weather']
     numeric_cols = ['year', 'mnth', 'hour', 'holiday', 'workingday', 'temp', 'humidity', 'windspeed']
 
-    # Create preprocessing pipeline
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_cols),
-            ('num', 'passthrough', numeric_cols)
-        ]
-    )
+    # Cache the split + encode step on disk, content-addressed by the input
+    # data: re-running this cell on the same frame skips the preprocessing
+    # and pays only for the model refit
+    memory = Memory(location=".sk_cache", verbose=0)
+
+    @memory.cache
+    def split_and_encode(X, y):
+        # The histogram model takes the categoricals as ordinal codes
+        # directly, so no one-hot blow-up of the feature matrix
+        preprocessor = ColumnTransformer(
+            transformers=[
+                ('cat', OrdinalEncoder(dtype=np.int32, handle_unknown='use_encoded_value', unknown_value=-1), categorical_cols),
+                ('num', 'passthrough', numeric_cols)
+            ],
+            verbose_feature_names_out=False
+        )
 
-    # Split the data into training and testing sets
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        # Split the data into training and testing sets
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-    # Create and train a RandomForest model
-    model = Pipeline([
-        ('preprocessor', preprocessor),
-        ('regressor', RandomForestRegressor(n_estimators=100, random_state=42))
-    ])
+        # Fit the preprocessor once and hand the model contiguous float32
+        # arrays, instead of re-running the ColumnTransformer inside a
+        # Pipeline on every fit/predict call
+        X_train = np.ascontiguousarray(preprocessor.fit_transform(X_train), dtype=np.float32)
+        X_test = np.ascontiguousarray(preprocessor.transform(X_test), dtype=np.float32)
+        return preprocessor, X_train, X_test, y_train, y_test
+
+    preprocessor, X_train, X_test, y_train, y_test = split_and_encode(X, y)
+
+    # Create and train a histogram-based gradient boosting model: it bins the
+    # features to uint8 once and trains on cache-resident histograms, which is
+    # far faster than growing 100 full-precision forest trees on this data
+    model = HistGradientBoostingRegressor(
+        max_iter=200,
+        learning_rate=0.05,
+        max_bins=255,
+        categorical_features=list(range(len(categorical_cols))),
+        early_stopping=True,
+        random_state=42,
+    )
 
     print("Training the model...")
-    model.fit(X_train, y_train)
+    model.fit(X_train, y_train.to_numpy(np.float32))
 
     # Make predictions
     y_pred = model.predict(X_test)
@@ -55,13 +88,15 @@ def train_and_evaluate_model(df: pd.DataFrame) -> None:
     print(f"Mean Absolute Error: {mae:.2f} bike rentals")
     print(f"R² Score: {r2:.4f}")
 
-    # Feature importance
-    feature_names = (
-        [f"{col}_{cat}" for col in categorical_cols for cat in sorted(df[col].unique())] +
-        numeric_cols
-    )
+    # Feature importance (the boosting model has no impurity-based
+    # importances, so measure them by permutation on the test split).
+    # The fitted preprocessor already knows the output column order, so ask
+    # it instead of maintaining a parallel hand-built list.
+    feature_names = list(preprocessor.get_feature_names_out())
     try:
-        importances = model.named_steps['regressor'].feature_importances_
+        importances = permutation_importance(
+            model, X_test, y_test, n_repeats=5, random_state=42
+        ).importances_mean
         indices = np.argsort(importances)[-10:]  # Top 10 features
         
         print("\nTop 10 Most Important Features:")
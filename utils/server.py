@@ -2,44 +2,51 @@
 This module provides a simple HTTP server to serve files from a specified directory.
 """
 import os
+import socket
 import webbrowser
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import HTTPServer, SimpleHTTPRequestHandler, ThreadingHTTPServer
 import threading
 import errno
 from pathlib import Path
-from functools import partial # Ensure partial is imported
+from functools import lru_cache, partial # Ensure partial is imported
 from urllib.parse import unquote, urlparse # Added for path handling
-import posixpath # Added for path handling in translate_path
 
 _original_cwd = os.getcwd()
 
+# Live servers keyed by (directory, port). Notebook cells tend to re-run
+# serve_docs with the same arguments; reusing the running server skips the
+# socket bind and avoids EADDRINUSE entirely.
+_SERVERS = {}
 
-class DirectorySpecificHandler(SimpleHTTPRequestHandler):
-    """Handler that serves files from a specific directory"""
 
-    def __init__(self, *args, directory=None, **kwargs):
-        if directory is None:
-            directory = os.getcwd()
-        self.directory = str(Path(directory).resolve())
-        # Pass directory to super() if supported (Python 3.7+)
-        super().__init__(*args, directory=self.directory, **kwargs)
+@lru_cache(maxsize=32)
+def _resolve_doc_dir(index_path: str) -> str:
+    """Resolve an index.html path (plain or file:// URL) to its parent directory.
 
-    def translate_path(self, path):
-        """Translate URL path to local filesystem path respecting the directory."""
-        # Use superclass method first if possible (might handle some cases)
-        # path_translated_by_super = super().translate_path(path) # Behavior varies by version
+    Memoized: notebook cells pass the same index_path repeatedly, and caching
+    skips the stat() calls of resolve() on every re-run.
+    """
+    if index_path.startswith("file://"):
+        parsed = urlparse(index_path)
+        index_path_obj = Path(unquote(parsed.path))
+        if os.name == 'nt' and str(index_path_obj).startswith('/'):
+            index_path_obj = Path(str(index_path_obj)[1:]) # Handle /C:/ paths
+    else:
+        index_path_obj = Path(index_path)
+    return str(index_path_obj.resolve().parent)
+
+
+class DocsHandler(SimpleHTTPRequestHandler):
+    """Request handler tuned for data-docs pages with many small assets."""
 
-        # Re-implement based on self.directory for consistency
-        path = posixpath.normpath(unquote(path))
-        words = path.split('/')
-        words = filter(None, words)
-        request_path = self.directory # Start with our target directory
-        for word in words:
-            # Disallow navigating up or accessing special directories
-            if os.path.dirname(word) or word in (os.curdir, os.pardir):
-                continue
-            request_path = os.path.join(request_path, word)
-        return request_path
+    # HTTP/1.1 keep-alive: one persistent connection serves all of a page's
+    # assets instead of paying a TCP handshake per file.
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Send small responses immediately instead of waiting on Nagle's algorithm.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
 
 def serve_docs(index_path, port=8000, open_browser=True):
@@ -55,47 +62,54 @@ def serve_docs(index_path, port=8000, open_browser=True):
         tuple: (HTTPServer, threading.Thread) or (None, None) if server fails to start.
     """
     try:
-        if isinstance(index_path, str) and index_path.startswith("file://"):
-            parsed = urlparse(index_path)
-            index_path_obj = Path(unquote(parsed.path))
-            if os.name == 'nt' and str(index_path_obj).startswith('/'):
-                 index_path_obj = Path(str(index_path_obj)[1:]) # Handle /C:/ paths
-        else:
-            index_path_obj = Path(index_path)
-        doc_directory = index_path_obj.resolve().parent
+        doc_directory_str = _resolve_doc_dir(str(index_path))
     except Exception as e:
          print(f"Error processing index path '{index_path}': {e}")
          return None, None
 
+    doc_directory = Path(doc_directory_str)
     if not doc_directory.is_dir():
         print(f"Error: Directory not found or invalid: {doc_directory}")
         return None, None
 
-    doc_directory_str = str(doc_directory)
-    Handler = partial(SimpleHTTPRequestHandler, directory=doc_directory_str)
-    # If using custom handler for older Python or specific needs:
-    # Handler = partial(DirectorySpecificHandler, directory=doc_directory_str)
+    key = (doc_directory_str, port)
+    cached = _SERVERS.get(key)
+    if cached is not None:
+        server, thread = cached
+        if thread.is_alive():
+            url = f"http://localhost:{port}/"
+            print(f"Reusing running server for '{doc_directory_str}' at {url}")
+            if open_browser:
+                webbrowser.open(url)
+            return server, thread
+        del _SERVERS[key]
+
+    Handler = partial(DocsHandler, directory=doc_directory_str)
 
     server = None
     try:
         # --- IMPORTANT FIX ---
         # Allow immediate reuse of the port after closing (bypass TIME_WAIT state).
-        HTTPServer.allow_reuse_address = True
+        ThreadingHTTPServer.allow_reuse_address = True
         # -------------------
 
-        server = HTTPServer(('localhost', port), Handler)
+        # A threaded server lets the browser fetch the page's CSS/JS/image
+        # assets concurrently instead of serializing behind each other.
+        server = ThreadingHTTPServer(('localhost', port), Handler)
+        server.daemon_threads = True  # don't block shutdown on lingering connections
         thread = threading.Thread(target=server.serve_forever)
         thread.start()
 
         url = f"http://localhost:{port}/" # Serve directory root
 
-        print(f"Serving directory '{doc_directory_str}' containing '{index_path_obj.name}'")
+        print(f"Serving directory '{doc_directory_str}' containing '{Path(str(index_path)).name}'")
         print(f"Access documentation at: {url}")
         print(f"Server running on port {port}. Run stop_server(server, thread) to stop.")
         
         if open_browser:
             webbrowser.open(url)
-        
+
+        _SERVERS[key] = (server, thread)
         return server, thread
 
     except OSError as e:
@@ -125,6 +139,11 @@ def stop_server(server, thread):
         print("Server or thread instance is None. Cannot stop (maybe it failed to start?).")
         return
 
+    # Drop the cache entry so the next serve_docs call starts afresh.
+    for key, value in list(_SERVERS.items()):
+        if value == (server, thread):
+            del _SERVERS[key]
+
     print(f"Shutting down server on port {server.server_port}...")
     try:
         server.shutdown()  # Signal server thread to stop listening